@@ -18,16 +18,457 @@ Date: 2024
 
 import os
 import json
-import requests
-import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import pickle
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from dotenv import load_dotenv
+import aiohttp
 import openai
+from aiolimiter import AsyncLimiter
+
+# Faster JSON parsing/serialization; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional JIT for the JSON span scanner; the pure-Python version is used otherwise
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional columnar results table / Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Optional near-duplicate headline detection; URL dedup works without it
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = None
+    MinHashLSH = None
+
+# Optional io_uring bulk writer (Linux); JSONL output falls back to buffered writes
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+# Optional semantic cache backend; exact-match caching works without it
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    faiss = None
+    SentenceTransformer = None
 
 # Load environment variables
 load_dotenv()
 
+
+def _scan_json_bytes(buf, pos, start, depth, in_string, escape):
+    """
+    Advance a JSON object scan over buf[pos:], resuming from a saved state.
+    
+    Finds the first balanced top-level JSON object; brackets inside JSON
+    strings (including escaped quotes) are ignored. Returns
+    (end, start, depth, in_string, escape) where end is the offset just past
+    the object, or -1 if it has not closed yet.
+    """
+    for i in range(pos, len(buf)):
+        c = buf[i]
+        if start < 0:
+            # Replies are JSON objects; brackets in leading prose are ignored
+            if c == 123:  # '{'
+                start = i
+                depth = 1
+        elif in_string:
+            if escape:
+                escape = False
+            elif c == 92:  # '\\'
+                escape = True
+            elif c == 34:  # '"'
+                in_string = False
+        elif c == 34:
+            in_string = True
+        elif c == 91 or c == 123:
+            depth += 1
+        elif c == 93 or c == 125:  # ']' or '}'
+            depth -= 1
+            if depth == 0:
+                return i + 1, start, depth, in_string, escape
+    
+    return -1, start, depth, in_string, escape
+
+
+if njit is not None and np is not None:
+    scan_json_bytes = njit(cache=True)(_scan_json_bytes)
+    # Compile at import time so article analysis only sees the compiled path
+    scan_json_bytes(np.frombuffer(b"{}", dtype=np.uint8), 0, -1, 0, False, False)
+else:
+    scan_json_bytes = _scan_json_bytes
+
+
+def _byte_view(buf: Union[bytes, bytearray]):
+    """View a buffer (no copy) the way scan_json_bytes expects it."""
+    if scan_json_bytes is _scan_json_bytes:
+        return buf
+    return np.frombuffer(buf, dtype=np.uint8)
+
+
+def scan_json_span(buf: Union[bytes, bytearray]) -> Tuple[int, int]:
+    """Return (start, end) of the first balanced JSON object in buf, or (-1, -1)."""
+    end, start, _, _, _ = scan_json_bytes(_byte_view(buf), 0, -1, 0, False, False)
+    return (start, end) if end >= 0 else (-1, -1)
+
+
+class JsonSpanScanner:
+    """Incremental scan_json_span for a growing buffer; each byte is scanned once."""
+    
+    def __init__(self):
+        self.pos = 0
+        self.start = -1
+        self.end = -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, buf: Union[bytes, bytearray]) -> bool:
+        """Scan bytes appended to buf since the last call; True once the object has closed."""
+        if self.end < 0 and self.pos < len(buf):
+            self.end, self.start, self.depth, self.in_string, self.escape = scan_json_bytes(
+                _byte_view(buf), self.pos, self.start, self.depth, self.in_string, self.escape
+            )
+            self.pos = len(buf)
+        return self.end >= 0
+
+
+def _uppercase_ascii(codes) -> None:
+    """Uppercase ASCII letters in place in a flat array of code points."""
+    for i in range(codes.shape[0]):
+        c = codes[i]
+        if c >= 97 and c <= 122:  # 'a'..'z'
+            codes[i] = c - 32
+
+
+if njit is not None and np is not None:
+    uppercase_ascii = njit(cache=True)(_uppercase_ascii)
+    uppercase_ascii(np.zeros(1, dtype=np.uint32))
+else:
+    uppercase_ascii = _uppercase_ascii
+
+
+def aggregate_tickers(analyzed_articles: List[Dict]) -> Dict[str, int]:
+    """
+    Count how often each ticker is mentioned across analyzed articles.
+    
+    Tickers are stripped, uppercased and truncated to 8 characters before
+    counting, so "aapl " and "AAPL" are the same ticker.
+    """
+    tickers = [
+        ticker.strip()
+        for article in analyzed_articles
+        if isinstance(article.get('affected_stocks'), list)
+        for ticker in article['affected_stocks']
+        if isinstance(ticker, str) and ticker.strip()
+    ]
+    if not tickers:
+        return {}
+    
+    if np is None:
+        return dict(Counter(ticker[:8].upper() for ticker in tickers))
+    
+    arr = np.array(tickers, dtype='U8')
+    if njit is not None:
+        uppercase_ascii(arr.view(np.uint32))
+    else:
+        arr = np.char.upper(arr)
+    
+    unique, counts = np.unique(arr, return_counts=True)
+    return dict(zip(unique.tolist(), counts.tolist()))
+
+
+class AsyncLocalWriter:
+    """
+    Write-only file writer that queues writes on an io_uring.
+    
+    Each write becomes one SQE at an explicit file offset. SQEs are submitted
+    in batches and completions are reaped without blocking, so many writes
+    share a single syscall.
+    """
+    
+    QUEUE_DEPTH = 64
+    SUBMIT_BATCH = 32
+    
+    def __init__(self, path: str):
+        """Open the file and set up the ring; raises OSError if io_uring is unavailable."""
+        if liburing is None:
+            raise OSError("liburing is not installed")
+        
+        self.path = path
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(self.QUEUE_DEPTH, self._ring)
+        try:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            liburing.io_uring_queue_exit(self._ring)
+            raise
+        
+        self._offset = 0
+        self._next_id = 0
+        self._unsubmitted = 0
+        self._in_flight = {}  # user_data -> (offset, buffer), kept alive until completion
+    
+    @classmethod
+    def create(cls, path: str) -> Optional['AsyncLocalWriter']:
+        """Return a writer for path, or None if io_uring cannot be used here."""
+        if liburing is None:
+            return None
+        try:
+            return cls(path)
+        except OSError:
+            # Kernel without io_uring, or blocked by seccomp in containers
+            return None
+    
+    def write(self, data: bytes) -> None:
+        """Queue data to be written at the current end of the file."""
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        if sqe is None:
+            # Submission queue full: flush it and retry
+            self._submit()
+            self._reap(wait=True)
+            sqe = liburing.io_uring_get_sqe(self._ring)
+        
+        liburing.io_uring_prep_write(sqe, self._fd, data, self._offset)
+        liburing.io_uring_sqe_set_data64(sqe, self._next_id)
+        self._in_flight[self._next_id] = (self._offset, data)
+        self._next_id += 1
+        self._offset += len(data)
+        self._unsubmitted += 1
+        
+        if self._unsubmitted >= self.SUBMIT_BATCH:
+            self._submit()
+            self._reap(wait=len(self._in_flight) >= self.QUEUE_DEPTH)
+    
+    def _submit(self) -> None:
+        """Submit all queued SQEs in one syscall."""
+        if self._unsubmitted:
+            liburing.io_uring_submit(self._ring)
+            self._unsubmitted = 0
+    
+    def _reap(self, wait: bool = False) -> None:
+        """Process available completions, optionally blocking for at least one."""
+        if wait and self._in_flight:
+            liburing.io_uring_wait_cqe(self._ring, self._cqe)
+        
+        # Entries are consumed one at a time from the CQ head, which handles
+        # ring wrap-around; peeking ready entries needs no syscall
+        while liburing.io_uring_cq_ready(self._ring):
+            liburing.io_uring_peek_cqe(self._ring, self._cqe)
+            entry = self._cqe[0]
+            user_data, written = entry.user_data, entry.res
+            liburing.io_uring_cq_advance(self._ring, 1)
+            
+            offset, data = self._in_flight.pop(user_data)
+            if written < 0:
+                raise OSError(-written, os.strerror(-written), self.path)
+            if written < len(data):
+                # Short write: finish the remainder synchronously
+                os.pwrite(self._fd, data[written:], offset + written)
+    
+    def close(self) -> None:
+        """Flush outstanding writes, then release the ring and the file."""
+        try:
+            self._submit()
+            while self._in_flight:
+                self._reap(wait=True)
+        finally:
+            liburing.io_uring_queue_exit(self._ring)
+            os.close(self._fd)
+    
+    def __enter__(self) -> 'AsyncLocalWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of AI analyses: exact SHA256 match on the headline, then
+    nearest-neighbour lookup on the headline + description embedding.
+    """
+    
+    def __init__(self, index_path: str = "cache.faiss", entries_path: str = "cache.jsonl",
+                 similarity_threshold: float = 0.92,
+                 model_name: str = "all-MiniLM-L6-v2"):
+        """Load any cached analyses persisted by previous runs."""
+        self.index_path = index_path
+        self.entries_path = entries_path
+        self.similarity_threshold = similarity_threshold
+        
+        self.entries = []  # Parsed analyses, row-aligned with the vector index
+        self.exact_index = {}  # SHA256(title) -> row
+        
+        self.embedder = None
+        self.index = None
+        if SentenceTransformer is not None:
+            self.embedder = SentenceTransformer(model_name)
+            self.index = faiss.IndexFlatIP(self.embedder.get_sentence_embedding_dimension())
+        else:
+            print("⚠️  sentence-transformers/faiss not installed, using exact-match cache only")
+        
+        self._load()
+    
+    # NewsAPI fills title/description of taken-down articles with this placeholder
+    PLACEHOLDER_TEXT = '[removed]'
+    
+    @classmethod
+    def _clean(cls, value: Optional[str]) -> str:
+        """Strip a text field, treating NewsAPI placeholders as empty."""
+        value = (value or '').strip()
+        return '' if value.lower() == cls.PLACEHOLDER_TEXT else value
+    
+    @classmethod
+    def _key(cls, article: Dict) -> Optional[str]:
+        """Exact-match key for an article, or None if it has no usable title."""
+        title = cls._clean(article.get('title'))
+        if not title:
+            return None
+        return hashlib.sha256(title.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def _text(cls, article: Dict) -> str:
+        """Text that gets embedded for semantic lookups (empty if there is none)."""
+        parts = (cls._clean(article.get('title')), cls._clean(article.get('description')))
+        return ' '.join(part for part in parts if part)
+    
+    def _embed(self, texts: List[str]):
+        """Embed texts in one batched call as normalized float32 vectors (cosine == inner product)."""
+        return self.embedder.encode(texts, batch_size=64, normalize_embeddings=True,
+                                    convert_to_numpy=True,
+                                    show_progress_bar=False).astype(np.float32)
+    
+    def _load(self) -> None:
+        """Load cached entries and the vector index from disk."""
+        if not os.path.exists(self.entries_path):
+            return
+        
+        try:
+            with open(self.entries_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry['key'] is not None:
+                            self.exact_index[entry['key']] = len(self.entries)
+                        self.entries.append(entry)
+            
+            if self.index is not None:
+                if os.path.exists(self.index_path):
+                    self.index = faiss.read_index(self.index_path)
+                # Rebuild if the index is missing or out of step with the entries
+                if self.index.ntotal != len(self.entries):
+                    self.index.reset()
+                    if self.entries:
+                        self.index.add(self._embed([e['text'] for e in self.entries]))
+            
+            print(f"✅ Loaded {len(self.entries)} cached analyses")
+            
+        except Exception as e:
+            print(f"❌ Error loading analysis cache: {e}")
+            self.entries = []
+            self.exact_index = {}
+            if self.index is not None:
+                self.index.reset()
+    
+    def lookup(self, article: Dict) -> Optional[Dict]:
+        """Return a cached analysis for the article, or None on a miss."""
+        return self.lookup_many([article])[0]
+    
+    def lookup_many(self, articles: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Return cached analyses for several articles, None for each miss.
+        
+        Exact-match misses are embedded and searched as a single batch.
+        """
+        results = []
+        misses = []
+        for i, article in enumerate(articles):
+            key = self._key(article)
+            row = self.exact_index.get(key) if key is not None else None
+            results.append(self.entries[row]['analysis'] if row is not None else None)
+            if row is None and self._text(article):
+                misses.append(i)
+        
+        if not misses or self.index is None or self.index.ntotal == 0:
+            return results
+        
+        scores, rows = self.index.search(self._embed([self._text(articles[i]) for i in misses]), 1)
+        for j, i in enumerate(misses):
+            if scores[j, 0] >= self.similarity_threshold:
+                results[i] = self.entries[int(rows[j, 0])]['analysis']
+        
+        return results
+    
+    def add(self, article: Dict, analysis: Dict) -> None:
+        """Store a fresh analysis and append it to the on-disk entries file."""
+        self.add_many([article], [analysis])
+    
+    def add_many(self, articles: List[Dict], analyses: List[Dict]) -> None:
+        """Store fresh analyses, embedding them in one batch, and append them to disk."""
+        # Articles with no usable title or description can't be matched later
+        entries = [
+            {
+                'key': self._key(article),
+                'text': self._text(article),
+                'analysis': analysis
+            }
+            for article, analysis in zip(articles, analyses)
+            if self._text(article)
+        ]
+        if not entries:
+            return
+        
+        for entry in entries:
+            if entry['key'] is not None:
+                self.exact_index[entry['key']] = len(self.entries)
+            self.entries.append(entry)
+        if self.index is not None:
+            self.index.add(self._embed([entry['text'] for entry in entries]))
+        
+        try:
+            with open(self.entries_path, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except Exception as e:
+            print(f"❌ Error writing analysis cache: {e}")
+    
+    def save(self) -> None:
+        """Persist the vector index alongside the entries file."""
+        if self.index is None:
+            return
+        
+        try:
+            faiss.write_index(self.index, self.index_path)
+        except Exception as e:
+            print(f"❌ Error saving analysis cache index: {e}")
+
+
 class FinancialNewsAnalyzer:
     """
     Main class for analyzing financial news and determining stock impacts.
@@ -39,8 +480,11 @@ class FinancialNewsAnalyzer:
         self.news_api_key = os.getenv('NEWS_API_KEY')
         self.openrouter_api_key = os.getenv('OPENROUTER_API_KEY')
         
-        # OpenRouter configuration - Using Llama 2 70B as it's free and powerful
-        self.openrouter_model = os.getenv('OPENROUTER_MODEL', 'meta-llama/llama-2-70b-chat')
+        # OpenRouter configuration - a small, fast instruct model handles the
+        # first pass; only low-confidence results go to the larger model
+        self.openrouter_model = os.getenv('OPENROUTER_MODEL', 'meta-llama/llama-3.1-8b-instruct')
+        self.openrouter_fallback_model = os.getenv('OPENROUTER_FALLBACK_MODEL',
+                                                   'meta-llama/llama-3.1-70b-instruct')
         
         # API endpoints
         self.news_api_url = "https://newsapi.org/v2/everything"
@@ -49,8 +493,21 @@ class FinancialNewsAnalyzer:
         # Rate limiting and request tracking
         self.news_requests_today = 0
         self.max_news_requests = 100  # NewsAPI free tier limit
-        self.last_request_time = 0
-        self.min_request_interval = 1  # Minimum seconds between requests
+        self.news_max_retries = 3  # Retries for transient NewsAPI failures
+        self.news_retry_backoff = 0.5  # Seconds before the first retry, doubled each time
+        self.news_retry_statuses = (429, 500, 502, 503, 504)
+        self._date_range = None  # NewsAPI (from, to) dates shared by all queries in a run
+        
+        # Token buckets: bursts are allowed, sustained rate matches provider limits
+        self._news_bucket = None
+        self._llm_bucket = None
+        self._bound_loop = None
+        
+        # Concurrency limits for AI requests (OpenRouter rate limits)
+        self.max_concurrent_ai_requests = 8
+        self.ai_batch_size = 5  # Articles analyzed per AI request
+        self.max_tokens_per_article = 120  # Response budget per article in a batch
+        self.io_uring_min_articles = 256  # JSONL output size at which io_uring is used
         
         # Validate API keys
         self._validate_api_keys()
@@ -60,6 +517,37 @@ class FinancialNewsAnalyzer:
             api_key=self.openrouter_api_key,
             base_url="https://openrouter.ai/api/v1"
         )
+        
+        # Async client and rate limiters so AI requests can run concurrently
+        self._create_loop_resources()
+        
+        # Cache of previous analyses so repeated stories skip the AI call
+        self.analysis_cache = AnalysisCache()
+        
+        # Articles seen in this and previous runs, so duplicates never reach the AI
+        self.seen_articles_path = "seen_articles.pkl"
+        self.minhash_num_perm = 64
+        self._seen_urls = set()
+        self._seen_minhash = None
+        self._load_seen_articles()
+    
+    def _create_loop_resources(self) -> None:
+        """Create the rate limiters and async AI client used by one event loop."""
+        self._news_bucket = AsyncLimiter(max_rate=self.max_news_requests, time_period=86400)
+        self._llm_bucket = AsyncLimiter(max_rate=60, time_period=60)  # OpenRouter requests/minute
+        self.async_client = openai.AsyncOpenAI(
+            api_key=self.openrouter_api_key,
+            base_url="https://openrouter.ai/api/v1"
+        )
+    
+    def _bind_event_loop(self) -> None:
+        """Recreate loop-bound resources when called from a new event loop (each asyncio.run)."""
+        loop = asyncio.get_running_loop()
+        if self._bound_loop is None:
+            self._bound_loop = loop
+        elif self._bound_loop is not loop:
+            self._bound_loop = loop
+            self._create_loop_resources()
     
     def _validate_api_keys(self) -> None:
         """Validate that required API keys are present."""
@@ -71,12 +559,6 @@ class FinancialNewsAnalyzer:
     
     def _check_rate_limits(self) -> bool:
         """Check if we can make another request without hitting rate limits."""
-        current_time = time.time()
-        
-        # Check if enough time has passed since last request
-        if current_time - self.last_request_time < self.min_request_interval:
-            time.sleep(self.min_request_interval)
-        
         # Check NewsAPI daily limit
         if self.news_requests_today >= self.max_news_requests:
             print("⚠️  Daily NewsAPI limit reached (100 requests)")
@@ -84,10 +566,42 @@ class FinancialNewsAnalyzer:
         
         return True
     
+    @staticmethod
+    def _utc_timestamp() -> str:
+        """Current UTC time as an ISO 8601 string with second precision."""
+        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    @staticmethod
+    def _compute_date_range() -> Tuple[str, str]:
+        """Calculate the NewsAPI date range (last 7 days for fresh news)."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=7)
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    
+    def _build_news_params(self, query: str, max_articles: int) -> Dict:
+        """Build NewsAPI query parameters."""
+        from_date, to_date = self._date_range or self._compute_date_range()
+        
+        return {
+            'q': query,
+            'apiKey': self.news_api_key,
+            'language': 'en',
+            'sortBy': 'publishedAt',
+            'pageSize': max_articles,
+            'from': from_date,
+            'to': to_date
+        }
+    
+    def _create_http_session(self) -> aiohttp.ClientSession:
+        """Create a shared aiohttp session for all outbound requests in a run."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        )
+    
     def fetch_financial_news(self, query: str = "finance investment stock market", 
                            max_articles: int = 10) -> List[Dict]:
         """
-        Fetch financial news from NewsAPI.
+        Fetch financial news from NewsAPI (synchronous wrapper).
         
         Args:
             query: Search query for financial news
@@ -96,260 +610,682 @@ class FinancialNewsAnalyzer:
         Returns:
             List of news articles with title, description, and content
         """
+        return asyncio.run(self.fetch_financial_news_async(query, max_articles))
+    
+    async def fetch_financial_news_async(self, query: str = "finance investment stock market",
+                                         max_articles: int = 10,
+                                         session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+        """
+        Fetch financial news from NewsAPI without blocking the event loop.
+        
+        Transient failures (429/5xx, connection errors, timeouts) are retried
+        with exponential backoff, honouring Retry-After when NewsAPI sends it.
+        
+        Args:
+            query: Search query for financial news
+            max_articles: Maximum number of articles to fetch
+            session: Shared aiohttp session; a temporary one is created if omitted
+            
+        Returns:
+            List of news articles with title, description, and content
+        """
+        if session is None:
+            async with self._create_http_session() as own_session:
+                return await self.fetch_financial_news_async(query, max_articles, own_session)
+        
         if not self._check_rate_limits():
             return []
+        self._bind_event_loop()
         
-        try:
-            # Calculate date range (last 7 days for fresh news)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=7)
+        params = self._build_news_params(query, max_articles)
+        print(f"📰 Fetching financial news for query: '{query}'")
+        
+        for attempt in range(self.news_max_retries + 1):
+            retry_after = None
+            try:
+                async with self._news_bucket:
+                    async with session.get(self.news_api_url, params=params,
+                                           timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        if response.status == 200:
+                            data = await response.json()
+                            break
+                        
+                        if (response.status not in self.news_retry_statuses
+                                or attempt == self.news_max_retries):
+                            print(f"❌ NewsAPI request failed: {response.status}")
+                            return []
+                        reason = f"HTTP {response.status}"
+                        retry_after = response.headers.get('Retry-After')
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.news_max_retries:
+                    print(f"❌ Error fetching news: {e}")
+                    return []
+                reason = str(e) or type(e).__name__
             
-            params = {
-                'q': query,
-                'apiKey': self.news_api_key,
-                'language': 'en',
-                'sortBy': 'publishedAt',
-                'pageSize': max_articles,
-                'from': start_date.strftime('%Y-%m-%d'),
-                'to': end_date.strftime('%Y-%m-%d')
+            delay = self.news_retry_backoff * (2 ** attempt)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(int(retry_after), 60))
+            print(f"⚠️  NewsAPI {reason}, retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+        
+        articles = data.get('articles', [])
+        
+        # Update request tracking
+        self.news_requests_today += 1
+        
+        print(f"✅ Fetched {len(articles)} articles")
+        
+        return self._process_news_articles(articles)
+    
+    async def fetch_news_for_queries(self, queries: List[str], max_articles: int,
+                                     session: aiohttp.ClientSession) -> List[Dict]:
+        """Fetch several NewsAPI queries concurrently and merge the results."""
+        results = await asyncio.gather(
+            *[self.fetch_financial_news_async(q, max_articles, session) for q in queries]
+        )
+        return [article for articles in results for article in articles]
+    
+    def _process_news_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Extract relevant information from raw NewsAPI articles."""
+        processed_articles = []
+        for article in articles:
+            processed_article = {
+                'title': article.get('title') or '',
+                'description': article.get('description') or '',
+                # Only the first 500 characters are ever sent to the AI
+                'content': (article.get('content') or '')[:500],
+                'url': article.get('url', ''),
+                'publishedAt': article.get('publishedAt', ''),
+                'source': article.get('source', {}).get('name', '')
             }
+            processed_articles.append(processed_article)
+        
+        return processed_articles
+    
+    def _load_seen_articles(self) -> None:
+        """Load the seen-article sets persisted by previous runs."""
+        if os.path.exists(self.seen_articles_path):
+            try:
+                with open(self.seen_articles_path, 'rb') as f:
+                    state = pickle.load(f)
+                self._seen_urls = state.get('seen_urls', set())
+                self._seen_minhash = state.get('seen_minhash')
+            except Exception as e:
+                print(f"❌ Error loading seen articles: {e}")
+        
+        if self._seen_minhash is None and MinHashLSH is not None:
+            self._seen_minhash = MinHashLSH(threshold=0.85, num_perm=self.minhash_num_perm)
+    
+    def _save_seen_articles(self) -> None:
+        """Persist the seen-article sets for the next run."""
+        try:
+            with open(self.seen_articles_path, 'wb') as f:
+                pickle.dump({
+                    'seen_urls': self._seen_urls,
+                    'seen_minhash': self._seen_minhash
+                }, f)
+        except Exception as e:
+            print(f"❌ Error saving seen articles: {e}")
+    
+    @staticmethod
+    def _canonicalize_url(url: str) -> str:
+        """Normalize a URL so the same article from different links compares equal."""
+        parts = urlsplit(url.strip())
+        netloc = parts.netloc.lower()
+        if netloc.startswith('www.'):
+            netloc = netloc[len('www.'):]
+        query = [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith('utm_')]
+        return urlunsplit((
+            'https' if parts.scheme.lower() == 'http' else parts.scheme.lower(),
+            netloc,
+            parts.path.rstrip('/'),
+            urlencode(sorted(query)),
+            ''
+        ))
+    
+    def _title_minhash(self, title: str):
+        """MinHash of a headline's character 3-shingles."""
+        text = ' '.join(title.lower().split())
+        minhash = MinHash(num_perm=self.minhash_num_perm)
+        for i in range(max(1, len(text) - 2)):
+            minhash.update(text[i:i + 3].encode('utf-8'))
+        return minhash
+    
+    def _url_hash(self, article: Dict) -> bytes:
+        """SHA1 of the article's canonicalized URL."""
+        return hashlib.sha1(self._canonicalize_url(article['url'] or '').encode('utf-8')).digest()
+    
+    def filter_new_articles(self, news_articles: List[Dict]) -> List[Dict]:
+        """
+        Drop articles already seen by URL or as a near-duplicate headline.
+        
+        Articles are only recorded as seen once they have been analyzed
+        (see mark_articles_seen), so failed analyses are retried next run.
+        
+        Args:
+            news_articles: List of fetched news articles
             
-            print(f"📰 Fetching financial news for query: '{query}'")
-            response = requests.get(self.news_api_url, params=params, timeout=30)
+        Returns:
+            Articles that have not been seen before
+        """
+        # Duplicates within this batch are tracked separately from the persisted sets
+        batch_urls = set()
+        batch_minhash = None
+        if MinHashLSH is not None:
+            batch_minhash = MinHashLSH(threshold=0.85, num_perm=self.minhash_num_perm)
+        
+        new_articles = []
+        for article in news_articles:
+            url_hash = self._url_hash(article)
+            if url_hash in self._seen_urls or url_hash in batch_urls:
+                continue
             
-            if response.status_code == 200:
-                data = response.json()
-                articles = data.get('articles', [])
-                
-                # Update request tracking
-                self.news_requests_today += 1
-                self.last_request_time = time.time()
-                
-                print(f"✅ Fetched {len(articles)} articles")
-                
-                # Extract relevant information from articles
-                processed_articles = []
-                for article in articles:
-                    processed_article = {
-                        'title': article.get('title', ''),
-                        'description': article.get('description', ''),
-                        'content': article.get('content', ''),
-                        'url': article.get('url', ''),
-                        'publishedAt': article.get('publishedAt', ''),
-                        'source': article.get('source', {}).get('name', '')
-                    }
-                    processed_articles.append(processed_article)
-                
-                return processed_articles
-            else:
-                print(f"❌ NewsAPI request failed: {response.status_code}")
-                return []
-                
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching news: {e}")
-            return []
+            title = article['title'] or ''
+            if batch_minhash is not None and title:
+                minhash = self._title_minhash(title)
+                if self._seen_minhash.query(minhash) or batch_minhash.query(minhash):
+                    continue
+                batch_minhash.insert(url_hash.hex(), minhash)
+            
+            batch_urls.add(url_hash)
+            new_articles.append(article)
+        
+        skipped = len(news_articles) - len(new_articles)
+        if skipped:
+            print(f"🔁 Skipped {skipped} duplicate or previously analyzed articles")
+        
+        return new_articles
+    
+    def mark_articles_seen(self, articles: List[Dict]) -> None:
+        """Record analyzed articles so later runs skip them."""
+        for article in articles:
+            url_hash = self._url_hash(article)
+            self._seen_urls.add(url_hash)
+            
+            title = article['title'] or ''
+            key = url_hash.hex()
+            if self._seen_minhash is not None and title and key not in self._seen_minhash:
+                self._seen_minhash.insert(key, self._title_minhash(title))
     
-    def analyze_news_sentiment_and_impact(self, news_articles: List[Dict]) -> List[Dict]:
+    def analyze_news_sentiment_and_impact(self, news_articles: List[Dict],
+                                          run_timestamp: Optional[str] = None) -> List[Dict]:
         """
         Analyze news articles for sentiment and stock impact using OpenRouter AI.
         
         Args:
             news_articles: List of news articles to analyze
+            run_timestamp: Timestamp shared by every article in the batch (defaults to now)
             
         Returns:
             List of analyzed articles with sentiment and stock impact
         """
-        analyzed_articles = []
+        return asyncio.run(self._analyze_articles_async(news_articles, run_timestamp))
+    
+    async def _analyze_articles_async(self, news_articles: List[Dict],
+                                      run_timestamp: Optional[str] = None) -> List[Dict]:
+        """Analyze articles in concurrent batches, capped by a semaphore."""
+        self._bind_event_loop()
+        run_timestamp = run_timestamp or self._utc_timestamp()
+        semaphore = asyncio.Semaphore(self.max_concurrent_ai_requests)
+        total = len(news_articles)
+        analyses = {}
         
-        for i, article in enumerate(news_articles, 1):
-            print(f"🤖 Analyzing article {i}/{len(news_articles)}: {article['title'][:50]}...")
+        # Reuse the analysis of identical or near-identical stories
+        pending = []
+        cached_analyses = self.analysis_cache.lookup_many(news_articles)
+        for i, (article, cached_analysis) in enumerate(zip(news_articles, cached_analyses)):
+            if cached_analysis is not None:
+                print(f"💾 Cache hit for article {i + 1}/{total}: {article['title'][:50]}...")
+                analyses[i] = cached_analysis
+            else:
+                pending.append(i)
+        
+        async def _analyze_batch(batch: List[int], model: str) -> Dict[int, Dict]:
+            batch_articles = [news_articles[i] for i in batch]
             
-            try:
+            async with semaphore, self._llm_bucket:
+                print(f"🤖 Analyzing {len(batch)} of {total} articles with {model}...")
+                
                 # Prepare the analysis prompt
-                analysis_prompt = self._create_analysis_prompt(article)
+                analysis_prompt = self._create_batch_prompt(batch_articles)
                 
                 # Get AI analysis
-                analysis_result = self._get_ai_analysis(analysis_prompt)
-                
-                # Parse the AI response
-                parsed_analysis = self._parse_ai_response(analysis_result)
-                
-                # Combine original article with analysis
-                analyzed_article = {
-                    'headline': article['title'],
-                    'description': article['description'],
-                    'url': article['url'],
-                    'publishedAt': article['publishedAt'],
-                    'source': article['source'],
-                    'sentiment': parsed_analysis.get('sentiment', 'neutral'),
-                    'affected_stocks': parsed_analysis.get('affected_stocks', []),
-                    'impact_description': parsed_analysis.get('impact_description', ''),
-                    'confidence': parsed_analysis.get('confidence', 'medium'),
-                    'analysis_timestamp': datetime.now().isoformat()
-                }
-                
-                analyzed_articles.append(analyzed_article)
-                
-                # Rate limiting between AI requests
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"❌ Error analyzing article {i}: {e}")
-                # Add article with default neutral analysis
-                analyzed_article = {
-                    'headline': article['title'],
-                    'description': article['description'],
-                    'url': article['url'],
-                    'publishedAt': article['publishedAt'],
-                    'source': article['source'],
-                    'sentiment': 'neutral',
-                    'affected_stocks': [],
-                    'impact_description': 'Analysis failed',
-                    'confidence': 'low',
-                    'analysis_timestamp': datetime.now().isoformat()
-                }
-                analyzed_articles.append(analyzed_article)
+                analysis_result = await self._get_ai_analysis(
+                    analysis_prompt, max_tokens=len(batch) * self.max_tokens_per_article, model=model
+                )
+            
+            # Parse the AI response and map batch ids back to article positions
+            parsed_analyses = self._parse_ai_response(analysis_result, len(batch))
+            return {i: parsed_analyses[batch_id]
+                    for batch_id, i in enumerate(batch) if batch_id in parsed_analyses}
+        
+        async def _analyze_all(indexes: List[int], model: str) -> Dict[int, Dict]:
+            batches = [indexes[j:j + self.ai_batch_size]
+                       for j in range(0, len(indexes), self.ai_batch_size)]
+            results = await asyncio.gather(
+                *[_analyze_batch(batch, model) for batch in batches],
+                return_exceptions=True
+            )
+            
+            fresh_analyses = {}
+            for batch, batch_analyses in zip(batches, results):
+                if isinstance(batch_analyses, Exception):
+                    print(f"❌ Error analyzing {len(batch)} articles with {model}: {batch_analyses}")
+                    continue
+                fresh_analyses.update(batch_analyses)
+            return fresh_analyses
+        
+        fresh_analyses = await _analyze_all(pending, self.openrouter_model)
+        
+        # Escalate low-confidence or failed first-pass results to the larger model
+        if self.openrouter_fallback_model and self.openrouter_fallback_model != self.openrouter_model:
+            low_confidence = [i for i in pending
+                              if fresh_analyses.get(i, {}).get('confidence', 'low') == 'low']
+            if low_confidence:
+                print(f"🔁 Re-analyzing {len(low_confidence)} low-confidence articles")
+                fresh_analyses.update(await _analyze_all(low_confidence, self.openrouter_fallback_model))
+        
+        for i in pending:
+            # Add article with default neutral analysis if the model gave none
+            analyses[i] = fresh_analyses.get(i, {
+                'sentiment': 'neutral',
+                'affected_stocks': [],
+                'impact_description': 'Analysis failed',
+                'confidence': 'low'
+            })
+        
+        # Only cache analyses that actually came back from the model
+        fresh = [i for i in pending if i in fresh_analyses]
+        self.analysis_cache.add_many([news_articles[i] for i in fresh],
+                                     [fresh_analyses[i] for i in fresh])
+        self.analysis_cache.save()
+        
+        # Failed articles stay unseen so a later run retries them
+        pending_set = set(pending)
+        self.mark_articles_seen([article for i, article in enumerate(news_articles)
+                                 if i not in pending_set or i in fresh_analyses])
+        
+        analyzed_articles = []
+        for i, article in enumerate(news_articles):
+            parsed_analysis = analyses[i]
+            
+            # Combine original article with analysis
+            analyzed_article = {
+                'headline': article['title'],
+                'description': article['description'],
+                'url': article['url'],
+                'publishedAt': article['publishedAt'],
+                'source': article['source'],
+                'sentiment': parsed_analysis.get('sentiment', 'neutral'),
+                'affected_stocks': parsed_analysis.get('affected_stocks', []),
+                'impact_description': parsed_analysis.get('impact_description', ''),
+                'confidence': parsed_analysis.get('confidence', 'medium'),
+                'analysis_timestamp': run_timestamp
+            }
+            analyzed_articles.append(analyzed_article)
         
         return analyzed_articles
     
-    def _create_analysis_prompt(self, article: Dict) -> str:
-        """Create a detailed prompt for AI analysis."""
-        prompt = f"""
-You are a financial analyst specializing in news sentiment analysis and stock market impact assessment.
-
-Please analyze the following financial news article and provide a structured response in JSON format:
+    # Static instructions sent as the system message. Kept first and identical
+    # across requests so providers can reuse the cached prompt prefix.
+    ANALYSIS_SYSTEM_PROMPT = """You are a financial analyst specializing in news sentiment analysis and stock market impact assessment.
 
-HEADLINE: {article['title']}
-DESCRIPTION: {article['description']}
-CONTENT: {article['content'][:500]}...
+You will be given a JSON array of financial news articles, each with an "id", "headline", "description" and "content". Analyze every article and provide a structured response in JSON format.
 
-Analyze this news for:
+Analyze each article for:
 1. SENTIMENT: Determine if the news is positive, negative, or neutral for the financial markets
 2. AFFECTED STOCKS: Identify specific stocks, companies, or sectors that might be affected
 3. IMPACT: Describe the potential impact on stock prices (increase, decrease, volatility, etc.)
 
-Respond in this exact JSON format:
-{{
-    "sentiment": "positive|negative|neutral",
-    "affected_stocks": ["AAPL", "GOOGL", "TSLA"],
-    "impact_description": "Detailed description of expected impact",
-    "confidence": "high|medium|low"
-}}
+Respond with a JSON object whose "analyses" array holds one object per article, in this exact format:
+{
+    "analyses": [
+        {
+            "id": 0,
+            "sentiment": "positive|negative|neutral",
+            "affected_stocks": ["AAPL", "GOOGL", "TSLA"],
+            "impact_description": "Concise description of expected impact",
+            "confidence": "high|medium|low"
+        }
+    ]
+}
 
 Guidelines:
 - Be specific about stock tickers when possible
 - Consider both direct and indirect impacts
 - Assess market sentiment realistically
 - Focus on actionable insights for investors
+- Use the "id" of each input article in its analysis
 """
-        return prompt
     
-    def _get_ai_analysis(self, prompt: str) -> str:
-        """Get analysis from OpenRouter AI model."""
+    def _create_batch_prompt(self, articles: List[Dict]) -> str:
+        """Create the per-request part of the prompt for a batch of articles."""
+        batch = [
+            {
+                'id': i,
+                'headline': article['title'],
+                'description': article['description'],
+                'content': article['content']
+            }
+            for i, article in enumerate(articles)
+        ]
+        if orjson is not None:
+            return orjson.dumps(batch).decode('utf-8')
+        return json.dumps(batch, ensure_ascii=False)
+    
+    def _build_messages(self, prompt: str, model: str) -> List[Dict]:
+        """Build chat messages with the static system prompt marked for caching."""
+        if model.startswith('anthropic/'):
+            # Anthropic models need an explicit cache breakpoint on the last system block
+            system_content = [
+                {
+                    "type": "text",
+                    "text": self.ANALYSIS_SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        else:
+            # Other providers cache identical prompt prefixes automatically
+            system_content = self.ANALYSIS_SYSTEM_PROMPT
+        
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def _get_ai_analysis(self, prompt: str, max_tokens: int = 500,
+                               model: Optional[str] = None) -> str:
+        """
+        Get analysis from OpenRouter AI model.
+        
+        The response is streamed and generation is aborted as soon as a
+        complete JSON value has arrived, skipping any trailing commentary.
+        """
+        model = model or self.openrouter_model
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.openrouter_model,
-                messages=[
-                    {"role": "system", "content": "You are a financial analyst expert. Provide accurate, well-reasoned analysis in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=self._build_messages(prompt, model),
                 temperature=0.3,  # Lower temperature for more consistent analysis
-                max_tokens=500
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+                stream=True
             )
             
-            return response.choices[0].message.content
+            buf = bytearray()
+            scanner = JsonSpanScanner()
+            try:
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    
+                    buf += delta.encode('utf-8')
+                    # Only the new bytes are scanned; stop once the JSON has closed
+                    if scanner.feed(buf):
+                        break
+            finally:
+                # Closing the connection stops the model generating further tokens
+                await response.response.aclose()
+            
+            return buf.decode('utf-8', errors='replace')
             
         except Exception as e:
             print(f"❌ AI analysis failed: {e}")
             return ""
     
-    def _parse_ai_response(self, ai_response: str) -> Dict:
-        """Parse the AI response and extract structured data."""
+    @staticmethod
+    def _normalize_tickers(value) -> List[str]:
+        """Coerce a model's affected_stocks value to a list of non-empty strings."""
+        if isinstance(value, str):
+            # A single ticker or a comma-separated string
+            value = value.split(',')
+        elif not isinstance(value, list):
+            return []
+        return [ticker.strip() for ticker in value
+                if isinstance(ticker, str) and ticker.strip()]
+    
+    def _parse_ai_response(self, ai_response: str, batch_size: int = 1) -> Dict[int, Dict]:
+        """
+        Parse a batched AI response into structured analyses keyed by article id.
+        
+        For a single-article batch, a bare analysis object without an "id" is
+        taken as the analysis of article 0.
+        """
         try:
-            # Try to extract JSON from the response
-            if '{' in ai_response and '}' in ai_response:
-                start = ai_response.find('{')
-                end = ai_response.rfind('}') + 1
-                json_str = ai_response[start:end]
+            # Try to extract the JSON from the response
+            buf = ai_response.encode('utf-8')
+            start, end = scan_json_span(buf)
+            
+            if start >= 0:
+                json_str = buf[start:end]
                 
-                parsed = json.loads(json_str)
+                parsed = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+                if isinstance(parsed, dict):
+                    # Accept a wrapper object or a single bare analysis
+                    parsed = (parsed['analyses'] or []) if 'analyses' in parsed else [parsed]
+                if not isinstance(parsed, list):
+                    raise ValueError("AI response analyses are not a list")
+                
+                if batch_size == 1 and len(parsed) == 1 and isinstance(parsed[0], dict):
+                    parsed[0].setdefault('id', 0)
                 
                 # Validate and clean the parsed data
-                return {
-                    'sentiment': parsed.get('sentiment', 'neutral').lower(),
-                    'affected_stocks': parsed.get('affected_stocks', []),
-                    'impact_description': parsed.get('impact_description', ''),
-                    'confidence': parsed.get('confidence', 'medium').lower()
-                }
+                analyses = {}
+                for item in parsed:
+                    if not isinstance(item, dict) or 'id' not in item:
+                        continue
+                    analyses[int(item['id'])] = {
+                        'sentiment': str(item.get('sentiment', 'neutral')).lower(),
+                        'affected_stocks': self._normalize_tickers(item.get('affected_stocks')),
+                        'impact_description': item.get('impact_description', ''),
+                        'confidence': str(item.get('confidence', 'medium')).lower()
+                    }
+                return analyses
             else:
                 raise ValueError("No JSON found in AI response")
                 
         except Exception as e:
             print(f"❌ Failed to parse AI response: {e}")
-            return {
-                'sentiment': 'neutral',
-                'affected_stocks': [],
-                'impact_description': 'Analysis parsing failed',
-                'confidence': 'low'
-            }
+            return {}
     
-    def save_analysis_results(self, analyzed_articles: List[Dict], 
-                            filename: str = "financial_news_analysis.json") -> None:
+    def build_results_table(self, analyzed_articles: List[Dict]):
         """
-        Save analysis results to a JSON file.
+        Build a columnar pyarrow Table from analyzed articles.
+        
+        Sentiment and confidence are dictionary-encoded and publishedAt is
+        parsed into a timestamp column in a single vectorized call.
         
         Args:
             analyzed_articles: List of analyzed articles
-            filename: Output filename
+            
+        Returns:
+            pyarrow.Table with one row per article
         """
-        output_data = {
-            'analysis_metadata': {
-                'total_articles': len(analyzed_articles),
-                'analysis_date': datetime.now().isoformat(),
-                'news_api_requests_used': self.news_requests_today,
-                'model_used': self.openrouter_model
-            },
-            'articles': analyzed_articles
+        if pa is None:
+            raise ImportError("pyarrow is required to build a results table")
+        
+        def column(name: str) -> List:
+            return [article.get(name) for article in analyzed_articles]
+        
+        def labels(name: str):
+            # Dictionary-encode, then narrow the indices to int8
+            encoded = pa.array(column(name), type=pa.string()).dictionary_encode()
+            return pa.DictionaryArray.from_arrays(encoded.indices.cast(pa.int8()),
+                                                  encoded.dictionary)
+        
+        published_at = pc.strptime(
+            pa.array(column('publishedAt'), type=pa.string()),
+            format='%Y-%m-%dT%H:%M:%SZ', unit='ms', error_is_null=True
+        )
+        
+        return pa.table({
+            'headline': pa.array(column('headline'), type=pa.string()),
+            'description': pa.array(column('description'), type=pa.string()),
+            'url': pa.array(column('url'), type=pa.string()),
+            'publishedAt': published_at,
+            'source': pa.array(column('source'), type=pa.string()),
+            'sentiment': labels('sentiment'),
+            'affected_stocks': pa.array(column('affected_stocks'), type=pa.list_(pa.string())),
+            'impact_description': pa.array(column('impact_description'), type=pa.string()),
+            'confidence': labels('confidence'),
+            'analysis_timestamp': pa.array(column('analysis_timestamp'), type=pa.string())
+        })
+    
+    def _build_analysis_metadata(self, analyzed_articles: List[Dict],
+                                 run_timestamp: Optional[str] = None) -> Dict:
+        """Build the metadata block written alongside analysis results."""
+        return {
+            'total_articles': len(analyzed_articles),
+            'analysis_date': run_timestamp or self._utc_timestamp(),
+            'news_api_requests_used': self.news_requests_today,
+            'model_used': self.openrouter_model,
+            'fallback_model': self.openrouter_fallback_model,
+            'ticker_counts': aggregate_tickers(analyzed_articles)
         }
+    
+    def save_analysis_results_jsonl(self, analyzed_articles: List[Dict],
+                                    path: str = "financial_news_analysis.jsonl",
+                                    run_timestamp: Optional[str] = None) -> None:
+        """
+        Stream analysis results to a JSON Lines file.
+        
+        The first line holds the analysis metadata, followed by one article per
+        line, so no serialized copy of the whole result set is held in memory.
+        
+        Args:
+            analyzed_articles: List of analyzed articles
+            path: Output filename
+            run_timestamp: Timestamp of the analysis run (defaults to now)
+        """
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(obj) -> bytes:
+                return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+        
+        try:
+            # Large outputs batch their writes through io_uring where available
+            writer = None
+            if len(analyzed_articles) >= self.io_uring_min_articles:
+                writer = AsyncLocalWriter.create(path)
+            
+            with writer if writer is not None else open(path, 'wb') as f:
+                f.write(dumps({'analysis_metadata': self._build_analysis_metadata(analyzed_articles, run_timestamp)}) + b'\n')
+                for article in analyzed_articles:
+                    f.write(dumps(article) + b'\n')
+            
+            print(f"✅ Analysis results saved to {path}")
+            
+        except Exception as e:
+            print(f"❌ Error saving results: {e}")
+    
+    def save_analysis_results(self, analyzed_articles: List[Dict], 
+                            filename: str = "financial_news_analysis.json",
+                            format: str = "json",
+                            run_timestamp: Optional[str] = None) -> None:
+        """
+        Save analysis results to a JSON, JSON Lines or Parquet file.
+        
+        Args:
+            analyzed_articles: List of analyzed articles
+            filename: Output filename (a .json name gets the matching extension for other formats)
+            format: "json", "jsonl" or "parquet"
+            run_timestamp: Timestamp of the analysis run (defaults to now)
+        """
+        if format in ("jsonl", "parquet") and filename.endswith('.json'):
+            filename = filename[:-len('.json')] + '.' + format
+        
+        if format == "jsonl":
+            self.save_analysis_results_jsonl(analyzed_articles, filename, run_timestamp)
+            self._save_seen_articles()
+            return
+        
+        analysis_metadata = self._build_analysis_metadata(analyzed_articles, run_timestamp)
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            if format == "parquet":
+                table = self.build_results_table(analyzed_articles)
+                table = table.replace_schema_metadata({
+                    'analysis_metadata': json.dumps(analysis_metadata)
+                })
+                pq.write_table(table, filename, compression="zstd")
+            else:
+                output_data = {
+                    'analysis_metadata': analysis_metadata,
+                    'articles': analyzed_articles
+                }
+                
+                if orjson is not None:
+                    with open(filename, 'wb') as f:
+                        f.write(orjson.dumps(output_data,
+                                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                else:
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        json.dump(output_data, f, indent=2, ensure_ascii=False)
             
             print(f"✅ Analysis results saved to {filename}")
             
         except Exception as e:
             print(f"❌ Error saving results: {e}")
+        
+        self._save_seen_articles()
     
-    def run_analysis(self, query: str = "finance investment", 
-                    max_articles: int = 5) -> List[Dict]:
+    def run_analysis(self, query: Union[str, List[str]] = "finance investment", 
+                    max_articles: int = 5, output_format: str = "json") -> List[Dict]:
         """
         Run the complete news analysis pipeline.
         
         Args:
-            query: News search query
-            max_articles: Maximum articles to analyze
+            query: News search query, or a list of queries fetched concurrently
+            max_articles: Maximum articles to analyze (per query)
+            output_format: Results file format: "json", "jsonl" or "parquet"
             
         Returns:
             List of analyzed articles
         """
+        return asyncio.run(self._run_analysis_async(query, max_articles, output_format))
+    
+    async def _run_analysis_async(self, query: Union[str, List[str]],
+                                  max_articles: int, output_format: str = "json") -> List[Dict]:
+        """Run the pipeline on a single event loop with one shared HTTP session."""
+        queries = [query] if isinstance(query, str) else list(query)
+        run_timestamp = self._utc_timestamp()
+        
         print("🚀 Starting Financial News Analysis...")
-        print(f"📊 Query: '{query}' | Max Articles: {max_articles}")
+        print(f"📊 Query: '{', '.join(queries)}' | Max Articles: {max_articles}")
         print(f"🤖 Using AI Model: {self.openrouter_model}")
         print("-" * 50)
         
-        # Step 1: Fetch news
-        news_articles = self.fetch_financial_news(query, max_articles)
+        # Step 1: Fetch news, with one date range shared by every query
+        self._date_range = self._compute_date_range()
+        try:
+            async with self._create_http_session() as session:
+                news_articles = await self.fetch_news_for_queries(queries, max_articles, session)
+        finally:
+            self._date_range = None
         
         if not news_articles:
             print("❌ No news articles found. Exiting.")
             return []
         
+        # Skip duplicates and articles analyzed in earlier runs
+        news_articles = self.filter_new_articles(news_articles)
+        
+        if not news_articles:
+            print("❌ No new articles to analyze. Exiting.")
+            self._save_seen_articles()
+            return []
+        
         # Step 2: Analyze sentiment and impact
-        analyzed_articles = self.analyze_news_sentiment_and_impact(news_articles)
+        analyzed_articles = await self._analyze_articles_async(news_articles, run_timestamp)
         
         # Step 3: Save results
-        self.save_analysis_results(analyzed_articles)
+        self.save_analysis_results(analyzed_articles, format=output_format,
+                                   run_timestamp=run_timestamp)
         
         print("-" * 50)
         print("✅ Analysis complete!")
@@ -0,0 +1,179 @@
+"""Tests for financial_news_analyzer."""
+
+import pytest
+
+import financial_news_analyzer as fna
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    """Analyzer with dummy API keys, writing its cache files under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('NEWS_API_KEY', 'test-news-key')
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    return fna.FinancialNewsAnalyzer()
+
+
+def _analyzed_article(**overrides):
+    article = {
+        'headline': 'Apple Reports Record Q4 Earnings',
+        'description': 'Apple beat expectations.',
+        'url': 'https://example.com/apple',
+        'publishedAt': '2024-01-15T09:00:00Z',
+        'source': 'Financial Times',
+        'sentiment': 'positive',
+        'affected_stocks': ['AAPL', 'MSFT'],
+        'impact_description': 'Tech sector boost',
+        'confidence': 'high',
+        'analysis_timestamp': '2024-01-15T10:30:00Z'
+    }
+    article.update(overrides)
+    return article
+
+
+def test_save_analysis_results_parquet_round_trip(analyzer, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    articles = [
+        _analyzed_article(),
+        _analyzed_article(headline='Fed holds rates', sentiment='neutral',
+                          affected_stocks=[], confidence='low')
+    ]
+
+    analyzer.save_analysis_results(articles, str(tmp_path / 'results.json'), format='parquet')
+
+    table = pq.read_table(tmp_path / 'results.parquet')
+    assert table.num_rows == 2
+    assert table.column('sentiment').to_pylist() == ['positive', 'neutral']
+    assert table.column('affected_stocks').to_pylist() == [['AAPL', 'MSFT'], []]
+    assert table.column('publishedAt')[0].as_py().year == 2024
+
+
+def test_build_results_table_uses_int8_dictionary_labels(analyzer):
+    pa = pytest.importorskip('pyarrow')
+    table = analyzer.build_results_table([_analyzed_article()])
+
+    assert table.schema.field('sentiment').type == pa.dictionary(pa.int8(), pa.string())
+    assert table.schema.field('confidence').type == pa.dictionary(pa.int8(), pa.string())
+
+
+HEADLINES = ['Apple beats quarterly earnings forecasts', 'Oil prices slide as OPEC output rises']
+
+
+def _news_article(i):
+    return {
+        'title': HEADLINES[i],
+        'description': f'Description {i}',
+        'content': '',
+        'url': f'https://example.com/story/{i}',
+        'publishedAt': '2024-01-15T09:00:00Z',
+        'source': 'Reuters'
+    }
+
+
+def test_failed_analyses_are_not_marked_seen(analyzer):
+    articles = [_news_article(0), _news_article(1)]
+    analyzer.openrouter_fallback_model = analyzer.openrouter_model  # single pass
+
+    async def failing_analysis(prompt, max_tokens=500, model=None):
+        return ""
+
+    analyzer._get_ai_analysis = failing_analysis
+    results = analyzer.analyze_news_sentiment_and_impact(analyzer.filter_new_articles(articles))
+    assert [r['impact_description'] for r in results] == ['Analysis failed'] * 2
+    assert analyzer.filter_new_articles(articles) == articles
+
+    async def good_analysis(prompt, max_tokens=500, model=None):
+        return ('{"analyses": [{"id": 0, "sentiment": "positive", "affected_stocks": ["AAPL"], '
+                '"impact_description": "up", "confidence": "high"}]}')
+
+    analyzer._get_ai_analysis = good_analysis
+    analyzer.analyze_news_sentiment_and_impact(analyzer.filter_new_articles(articles))
+    assert analyzer.filter_new_articles(articles) == [articles[1]]
+
+
+def test_scan_json_span_ignores_bracketed_prose():
+    buf = b'Note [batch 1]: {"analyses": []} trailing'
+    start, end = fna.scan_json_span(buf)
+    assert buf[start:end] == b'{"analyses": []}'
+
+
+def test_json_span_scanner_resumes_across_deltas():
+    reply = b'ok {"analyses": [{"id": 0, "impact_description": "a \\"}\\" ]"}]} tail'
+    scanner = fna.JsonSpanScanner()
+    buf = bytearray()
+    closed_at = None
+    for i in range(len(reply)):
+        buf += reply[i:i + 1]
+        if scanner.feed(buf):
+            closed_at = len(buf)
+            break
+
+    assert (scanner.start, scanner.end) == fna.scan_json_span(reply)
+    assert closed_at == scanner.end == reply.index(b' tail')
+
+
+def test_parse_ai_response_bare_object_for_single_article(analyzer):
+    reply = '{"sentiment": "Negative", "affected_stocks": ["XOM"], "impact_description": "down", "confidence": "High"}'
+
+    assert analyzer._parse_ai_response(reply, batch_size=1)[0]['sentiment'] == 'negative'
+    assert analyzer._parse_ai_response(reply, batch_size=2) == {}
+
+
+def test_parse_ai_response_null_analyses(analyzer):
+    assert analyzer._parse_ai_response('{"analyses": null}', batch_size=3) == {}
+
+
+def test_affected_stocks_string_is_normalized(analyzer):
+    reply = ('{"analyses": [{"id": 0, "sentiment": "positive", "affected_stocks": "TSLA", '
+             '"impact_description": "up", "confidence": "high"}]}')
+
+    assert analyzer._parse_ai_response(reply)[0]['affected_stocks'] == ['TSLA']
+
+
+def test_aggregate_tickers_skips_non_list_values():
+    articles = [{'affected_stocks': 'TSLA'}, {'affected_stocks': ['tsla', ' AAPL ']}]
+
+    assert fna.aggregate_tickers(articles) == {'AAPL': 1, 'TSLA': 1}
+
+
+def test_analysis_cache_ignores_placeholder_titles(tmp_path):
+    cache = fna.AnalysisCache(str(tmp_path / 'cache.faiss'), str(tmp_path / 'cache.jsonl'))
+    removed = {'title': '[Removed]', 'description': '[Removed]'}
+    cache.add_many([removed, {'title': '', 'description': 'Oil prices slide'}],
+                   [{'sentiment': 'negative'}, {'sentiment': 'negative'}])
+
+    assert cache.lookup(removed) is None
+    assert cache.lookup({'title': '', 'description': 'Chipmakers rally'}) is None
+
+    cache.add({'title': 'Apple beats forecasts', 'description': ''}, {'sentiment': 'positive'})
+    assert cache.lookup({'title': 'Apple beats forecasts', 'description': 'x'}) == {'sentiment': 'positive'}
+
+
+def test_fetch_news_retries_transient_status(analyzer):
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    calls = []
+
+    async def handler(request):
+        calls.append(request.query['q'])
+        if len(calls) == 1:
+            return web.Response(status=503)
+        return web.json_response({'articles': [
+            {'title': 'Fed Holds Rates', 'description': 'Steady.', 'url': 'https://example.com/fed',
+             'publishedAt': '2024-01-15T09:00:00Z', 'source': {'name': 'Reuters'}}
+        ]})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/v2/everything', handler)
+        async with TestServer(app) as server:
+            analyzer.news_api_url = str(server.make_url('/v2/everything'))
+            return await analyzer.fetch_financial_news_async('fed', max_articles=1)
+
+    analyzer.news_retry_backoff = 0
+    articles = fna.asyncio.run(run())
+
+    assert calls == ['fed', 'fed']
+    assert [a['title'] for a in articles] == ['Fed Holds Rates']
+    assert analyzer.news_requests_today == 1